@@ -2,10 +2,10 @@
 # Distributed under the MIT software license, see the accompanying file LICENSE
 
 from .exceptions import OrderBookError
-from .order_book import OrderBook
+from .order_book import OrderBook, UPDATE_ASK, UPDATE_BID, REMOVE_ASK, REMOVE_BID, HEARTBEAT, json_loads
 
 import json
-import socket
+import sys
 import websocket
 
 
@@ -18,6 +18,9 @@ class BitfinexOrderBook(OrderBook):
 
         self.channel_id_to_market = {}
 
+        # Encoded subscribe messages per market, which are reused when resubscribing after a restart
+        self.subscribe_messages = {}
+
     def connect(self):
         """
         Connect with the websocket API and return the handle. Raises OrderBookError in case of connection issues.
@@ -25,12 +28,7 @@ class BitfinexOrderBook(OrderBook):
         :return: handle of the socket connection
         """
 
-        try:
-            socket_handle = websocket.create_connection("wss://api.bitfinex.com/ws/2:443", timeout=self.timeout)
-        except (websocket.WebSocketException, socket.timeout, ConnectionError, TimeoutError) as e:
-            raise OrderBookError("Could not connect to websocket: %s" % e)
-
-        return socket_handle
+        return self.create_connection("wss://api.bitfinex.com/ws/2:443")
 
     def disconnect(self):
         """
@@ -51,37 +49,39 @@ class BitfinexOrderBook(OrderBook):
         :param quote_currency: desired quote currency
         """
 
-        # Subscribe to the market with P0 precision and live updating
-        request_data = {
-            'event': 'subscribe',
-            'channel': 'book',
-            'prec': 'P0',
-            'symbol': 't%s%s' % (base_currency.upper(), quote_currency.upper()),
-            'len': '100',
-            'freq': 'F0'
-        }
+        request_data = self.subscribe_messages.get((base_currency, quote_currency))
+
+        if request_data is None:
+
+            # Subscribe to the market with P0 precision and live updating
+            request_data = json.dumps({
+                'event': 'subscribe',
+                'channel': 'book',
+                'prec': 'P0',
+                'symbol': 't%s%s' % (base_currency.upper(), quote_currency.upper()),
+                'len': '100',
+                'freq': 'F0'
+            }).encode()
+
+            self.subscribe_messages[(base_currency, quote_currency)] = request_data
 
         # Send the instruction
-        self.socket_handle.send(json.dumps(request_data))
+        self.socket_handle.send(request_data)
 
-    def receive(self):
+    def process_message(self, received_message):
         """
-        Receive and process new websocket messages
+        Decode a single websocket message and process its contents
 
-        :return list: list of all messages received
+        :param received_message: the raw message
+        :return list: list of updates to be processed by the book
         """
 
-        try:
-            received_message = self.socket_handle.recv()
-        except (websocket.WebSocketException, TimeoutError, ConnectionError) as e:
-            raise OrderBookError("Websocket connection failed: %s" % e)
-
         # Discard empty messages
-        if len(str(received_message)) == 0:
+        if not received_message:
             return []
 
         try:
-            decoded_message = json.loads(received_message)
+            decoded_message = json_loads(received_message)
         except ValueError:
             raise OrderBookError("Couldn't decode JSON message after receiving update")
 
@@ -126,17 +126,14 @@ class BitfinexOrderBook(OrderBook):
             raise OrderBookError("No channel ID defined in message")
 
         # Verify that the given channel is not yet defined
-        try:
-            self.channel_id_to_market[channel_id]
-        except KeyError:
-            pass
-        else:
+        if channel_id in self.channel_id_to_market:
             raise OrderBookError("Received initialisation with channel ID %s, which is already defined" % channel_id)
 
         currency_base = pair[0:3]
         currency_quote = pair[3:6]
 
-        self.channel_id_to_market[channel_id] = [currency_base.lower(), currency_quote.lower()]
+        # Intern the currencies, so they are the same string objects as used in the data store
+        self.channel_id_to_market[channel_id] = [sys.intern(currency_base.lower()), sys.intern(currency_quote.lower())]
 
     def process_update(self, update_data):
         """
@@ -161,7 +158,7 @@ class BitfinexOrderBook(OrderBook):
 
         if len(update_data) == 2:
             if update_data[1] == 'hb':
-                update_messages.append(['heartbeat'])
+                update_messages.append((HEARTBEAT,))
             elif isinstance(update_data[1], list):
                 for item in update_data[1]:
                     update_messages.append(self.process_single_update(base_currency, quote_currency, item))
@@ -179,7 +176,7 @@ class BitfinexOrderBook(OrderBook):
         :param base_currency: market base currency
         :param quote_currency: market quote currency
         :param update: update message
-        :return list: internal update message, telling the order book what to change
+        :return tuple: internal update message, telling the order book what to change
         """
 
         rate = update[0]
@@ -189,16 +186,16 @@ class BitfinexOrderBook(OrderBook):
         if count == 0:
             # Delete at bids when amount is 1
             if amount == 1:
-                return ['remove_bid', base_currency, quote_currency, rate]
+                return REMOVE_BID, base_currency, quote_currency, rate
             # Delete at asks when amount is 1
             elif amount == -1:
-                return ['remove_ask', base_currency, quote_currency, rate]
+                return REMOVE_ASK, base_currency, quote_currency, rate
             else:
                 raise OrderBookError("Unexpected data in delete command")
 
         # Add an order
         else:
             if amount > 0:
-                return ['update_bid', base_currency, quote_currency, rate, amount]
+                return UPDATE_BID, base_currency, quote_currency, rate, amount
             else:
-                return ['update_ask', base_currency, quote_currency, rate, abs(amount)]
+                return UPDATE_ASK, base_currency, quote_currency, rate, abs(amount)
@@ -3,17 +3,65 @@
 
 
 from .exceptions import OrderBookError, OrderBookOutOfSync
-from .binary_search import get_index
 
-import datetime
+import json
 import logging
+import select
+import socket
 import sortedcontainers
+import ssl
+import sys
 import threading
 import time
+import websocket
+
+# Decode messages with orjson if it is installed, which is considerably faster than the json module
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 
 logger = logging.getLogger('OrderBook')
 
+# Types of the update messages, stored as the first element of each update message. The lowest bit of the update,
+# remove and load types indicates the side of the book: 0 for asks and 1 for bids. Load messages contain a dict with
+# many rates and amounts at once, for example from the initial data of a market.
+UPDATE_ASK, UPDATE_BID, REMOVE_ASK, REMOVE_BID, LOAD_ASK, LOAD_BID, HEARTBEAT = range(7)
+
+# Names of the order books in the market data structure, indexed by the side of the book
+ORDER_BOOK_SIDES = ('order_book_ask', 'order_book_bid')
+
+# Maximum number of messages received in a single receive, which limits the delay before a burst of updates is applied
+MAX_RECEIVED_MESSAGES = 500
+
+
+def top_asks(order_book, amount):
+    """
+    Get the top entries of the ask side of a book
+
+    :param order_book: sorted dict with the asks
+    :param amount: number of asks
+    :return list: list with the rate and amount of the top asks
+    """
+
+    return [[rate, order_book[rate]] for rate in order_book.islice(stop=amount)]
+
+
+def top_bids(order_book, amount):
+    """
+    Get the top entries of the bid side of a book
+
+    :param order_book: sorted dict with the bids
+    :param amount: number of bids
+    :return list: list with the rate and amount of the top bids
+    """
+
+    # The bids are sorted from low to high, so the top bids are the last entries in reversed order
+    start = max(len(order_book) - amount, 0)
+
+    return [[rate, order_book[rate]] for rate in order_book.islice(start=start, reverse=True)]
+
 
 class OrderBook(threading.Thread):
 
@@ -32,21 +80,30 @@ class OrderBook(threading.Thread):
         self.timeout = timeout
 
         self.data_store = {}
+        self.inactive_markets = 0
+        self.initialisation_event = threading.Event()
         self.socket_handle = None
         self.restart = False
         self.running = True
-        self.last_heartbeat = datetime.datetime.now()
+        self.last_heartbeat = time.monotonic()
 
         # Some exchanges specify that a delete of a non-existing order can happen. We do not raise errors if that
         # happens when this flag is set (in the child class).
         self.soft_delete_fail = False
 
+        # Handlers of the update messages, indexed by update type
+        self.update_handlers = (self.update_ask, self.update_bid, self.remove_ask, self.remove_bid, self.load_ask,
+                                self.load_bid)
+
     def run(self):
         """
         Main run function of the order book, executed in a thread using start(). Starts the order book and processes
         all communications.
         """
 
+        # Initialise the data structure
+        self.initialise_data_store()
+
         # Continue as long as there is no stop signal
         while self.running:
 
@@ -54,15 +111,6 @@ class OrderBook(threading.Thread):
             connection_tries = 0
             connection_delay = 0
 
-            # Initialise the data structure
-            for currency_pair in self.markets:
-                self.data_store[currency_pair['base_currency'], currency_pair['quote_currency']] = {
-                    'order_book_ask': sortedcontainers.SortedListWithKey(key=lambda val: val[0]),
-                    'order_book_bid': sortedcontainers.SortedListWithKey(key=lambda val: -val[0]),
-                    'last_sequence': None,
-                    'status': 'inactive',
-                }
-
             # Connect to the order book. Continue trying in case of issues or a temporary downtime
             while self.socket_handle is None:
 
@@ -108,11 +156,7 @@ class OrderBook(threading.Thread):
                     self.restart = True
 
                 else:
-                    # Process all updates
-                    if len(updates) > 0:
-                        for item in updates[:-1]:
-                            self.update(item)
-                        self.update(updates[-1], True)
+                    self.process_updates(updates)
 
             # Initialise a restart if requested
             if self.restart and self.running:
@@ -122,7 +166,7 @@ class OrderBook(threading.Thread):
                 self.disconnect()
 
                 # Reset data structures
-                self.data_store = {}
+                self.initialise_data_store()
                 self.socket_handle = None
                 self.restart = False
 
@@ -132,74 +176,222 @@ class OrderBook(threading.Thread):
         # Disconnect when shutting down
         self.disconnect()
 
-    def update(self, update_content, last_update=False):
+    def initialise_data_store(self):
+        """
+        Initialise the data structure of all markets. If the data structure already exists, in case of a restart, the
+        existing order books are emptied and reused instead of allocating new ones.
+        """
+
+        for currency_pair in self.markets:
+
+            # The currencies are interned, so the exchange specific classes can use the very same string objects in
+            # their update messages. Looking up the market in the data store then compares the strings by identity.
+            market = (sys.intern(currency_pair['base_currency']), sys.intern(currency_pair['quote_currency']))
+
+            try:
+                market_data = self.data_store[market]
+            except KeyError:
+                self.data_store[market] = {
+                    'order_book_ask': sortedcontainers.SortedDict(),
+                    'order_book_bid': sortedcontainers.SortedDict(),
+                    'last_sequence': None,
+                    'status': 'inactive',
+                }
+            else:
+                market_data['order_book_ask'].clear()
+                market_data['order_book_bid'].clear()
+                market_data['last_sequence'] = None
+                market_data['status'] = 'inactive'
+
+        # Keep track of the number of markets that are not active yet, so the initialisation status is known without
+        # inspecting every market
+        self.inactive_markets = len(self.data_store)
+        self.initialisation_event.clear()
+
+    def process_updates(self, updates):
+        """
+        Process a batch of update messages, as returned by a single receive. Afterwards, every market with an update or
+        load in the batch is set to active. A batch only contains complete messages, so all initial updates of those
+        markets have been processed.
+
+        :param updates: list with update messages
+        """
+
+        # Collapse the batch to a single update per rate, so every rate changes the book at most once
+        updates = self.coalesce_updates(updates)
+
+        update = self.update
+        updated_markets = set()
+
+        for update_content in updates:
+            update(update_content)
+
+            # Removals and heartbeats do not activate a market, as the initial data of a market consists of updates or
+            # loads
+            if update_content[0] != HEARTBEAT and update_content[0] != REMOVE_ASK and update_content[0] != REMOVE_BID:
+                updated_markets.add((update_content[1], update_content[2]))
+
+        for market in updated_markets:
+            self.activate_market(self.data_store[market])
+
+    def update(self, update_content):
         """
         Process an update message to update the state of the order book
 
         :param update_content: update message
-        :param last_update: whether this update is the last one in this receive. In that case the market can be set to
-                            'active' in case it is not yet, as all initial updates must have been processed
         """
 
-        # Update the last heartbeat time
-        self.last_heartbeat = datetime.datetime.now()
+        # Update the last heartbeat time. No further action required for heartbeats
+        self.last_heartbeat = time.monotonic()
 
-        # No further action required for heartbeats
-        if update_content[0] == 'heartbeat':
+        if update_content[0] == HEARTBEAT:
             return
 
-        market = (update_content[1], update_content[2])
+        # Pass the update to the handler of its type
+        self.update_handlers[update_content[0]](self.data_store[(update_content[1], update_content[2])], update_content)
 
-        if update_content[0] == 'update_ask':
-            index = get_index(update_content[3], self.data_store[market]['order_book_ask'])
+    def update_ask(self, market_data, update_content):
+        """
+        Insert or update an entry on the ask side of the book
 
-            # Update the value if an existing entry is found, or insert it if the entry is new
-            if index is False:
-                self.data_store[market]['order_book_ask'].add([update_content[3], update_content[4]])
-            else:
-                self.data_store[market]['order_book_ask'][index] = [update_content[3], update_content[4]]
+        :param market_data: data structure of the market
+        :param update_content: update message
+        """
 
-            # Make sure the market is set to active if we are sure that all possible initial updates are processed,
-            # which we are if this is the last update of this receive
-            if last_update and self.data_store[market]['status'] != 'active':
-                self.data_store[market]['status'] = 'active'
+        # Update the value if an existing entry is found, or insert it if the entry is new
+        market_data['order_book_ask'][update_content[3]] = update_content[4]
 
-        elif update_content[0] == 'update_bid':
-            index = get_index(update_content[3], self.data_store[market]['order_book_bid'], True)
+    def update_bid(self, market_data, update_content):
+        """
+        Insert or update an entry on the bid side of the book
 
-            # Update the value if an existing entry is found, or insert it if the entry is new
-            if index is False:
-                self.data_store[market]['order_book_bid'].add([update_content[3], update_content[4]])
-            else:
-                self.data_store[market]['order_book_bid'][index] = [update_content[3], update_content[4]]
+        :param market_data: data structure of the market
+        :param update_content: update message
+        """
 
-            # Make sure the market is set to active if we are sure that all possible initial updates are processed,
-            # which we are if this is the last update of this receive
-            if last_update and self.data_store[market]['status'] != 'active':
-                self.data_store[market]['status'] = 'active'
+        # Update the value if an existing entry is found, or insert it if the entry is new
+        market_data['order_book_bid'][update_content[3]] = update_content[4]
 
-        elif update_content[0] == 'remove_ask':
-            index = get_index(update_content[3], self.data_store[market]['order_book_ask'])
+    def remove_ask(self, market_data, update_content):
+        """
+        Remove an entry from the ask side of the book
 
-            if index is False:
-                if not self.soft_delete_fail:
-                    logger.error("Request to delete not existing sell order with rate %s. Restarting." %
-                                 update_content[3])
-                    self.restart = True
-            else:
-                del self.data_store[market]['order_book_ask'][index]
+        :param market_data: data structure of the market
+        :param update_content: update message
+        """
 
-        elif update_content[0] == 'remove_bid':
-            index = get_index(update_content[3], self.data_store[market]['order_book_bid'], True)
+        if market_data['order_book_ask'].pop(update_content[3], None) is None:
+            if not self.soft_delete_fail:
+                logger.error("Request to delete not existing sell order with rate %s. Restarting." % update_content[3])
+                self.restart = True
 
-            if index is False:
-                if not self.soft_delete_fail:
-                    logger.error("Request to delete not existing buy order with rate %s. Restarting." %
-                                 update_content[3])
-                    self.restart = True
+    def remove_bid(self, market_data, update_content):
+        """
+        Remove an entry from the bid side of the book
 
-            else:
-                del self.data_store[market]['order_book_bid'][index]
+        :param market_data: data structure of the market
+        :param update_content: update message
+        """
+
+        if market_data['order_book_bid'].pop(update_content[3], None) is None:
+            if not self.soft_delete_fail:
+                logger.error("Request to delete not existing buy order with rate %s. Restarting." % update_content[3])
+                self.restart = True
+
+    def load_ask(self, market_data, update_content):
+        """
+        Insert or update many entries on the ask side of the book at once
+
+        :param market_data: data structure of the market
+        :param update_content: update message
+        """
+
+        # Loading many entries at once lets the sorted dict sort the rates in bulk, instead of inserting them one by one
+        market_data['order_book_ask'].update(update_content[3])
+
+    def load_bid(self, market_data, update_content):
+        """
+        Insert or update many entries on the bid side of the book at once
+
+        :param market_data: data structure of the market
+        :param update_content: update message
+        """
+
+        # Loading many entries at once lets the sorted dict sort the rates in bulk, instead of inserting them one by one
+        market_data['order_book_bid'].update(update_content[3])
+
+    def activate_market(self, market_data):
+        """
+        Set a market to active, if it is not yet
+
+        :param market_data: data structure of the market
+        """
+
+        if market_data['status'] != 'active':
+            market_data['status'] = 'active'
+            self.inactive_markets -= 1
+
+            # Signal anyone waiting for the initialisation when the last market becomes active
+            if self.inactive_markets == 0:
+                self.initialisation_event.set()
+
+    def coalesce_updates(self, updates):
+        """
+        Collapse a batch of update messages to the net change per rate. A later update for a rate overwrites the earlier
+        updates since the last removal of that rate, so only the last one is kept. A removal is only dropped, together
+        with the update before it, if the rate was added in this batch and not loaded in it. All other removals are
+        kept, so the book still verifies that the removed rate exists. The remaining updates keep their relative order,
+        but heartbeats are collapsed into the first one, so the last collapsed update is not necessarily the last update
+        of the batch.
+
+        :param updates: list with update messages
+        :return list: list with the net update messages
+        """
+
+        net_updates = {}
+
+        # Number of removals kept per rate. Updates of a rate are only overwritten up to the last kept removal.
+        removals = {}
+
+        # Markets and sides of the book with a load in this batch. Their rates are not in the book yet when the batch
+        # is collapsed, so removals on those sides are always kept.
+        loaded_sides = set()
+
+        for update_content in updates:
+
+            # A single heartbeat suffices to update the heartbeat time
+            if update_content[0] == HEARTBEAT:
+                net_updates.setdefault(HEARTBEAT, update_content)
+                continue
+
+            # Loads contain many rates, they are kept as they are under a key of their own
+            if update_content[0] == LOAD_ASK or update_content[0] == LOAD_BID:
+                loaded_sides.add((update_content[1], update_content[2], update_content[0] & 1))
+                net_updates[object()] = update_content
+                continue
+
+            # Updates and removals of the same side share a key
+            side = update_content[0] & 1
+            key = (update_content[1], update_content[2], side, update_content[3])
+            removal_count = removals.get(key, 0)
+
+            if update_content[0] == UPDATE_ASK or update_content[0] == UPDATE_BID:
+                net_updates.pop((key, removal_count), None)
+                net_updates[key, removal_count] = update_content
+                continue
+
+            # A removal cancels out with the update before it if that update was the first one of the rate in this
+            # batch and the rate was not in the book yet, nor loaded earlier in this batch
+            if removal_count == 0 and (key, 0) in net_updates and key[:3] not in loaded_sides and \
+                    update_content[3] not in self.data_store[key[0], key[1]][ORDER_BOOK_SIDES[side]]:
+                del net_updates[key, 0]
+                continue
+
+            # Keep all other removals, so the book verifies that the removed rate exists
+            removals[key] = removal_count + 1
+            net_updates[object()] = update_content
+
+        return list(net_updates.values())
 
     def verify_status(self, base_currency, quote_currency, last_heartbeat_interval=10):
         """
@@ -209,6 +401,7 @@ class OrderBook(threading.Thread):
         :param base_currency: market base currency
         :param quote_currency: market quote_currency
         :param last_heartbeat_interval: maximum allowed time in seconds since the last heartbeat
+        :return dict: data structure of the market
         """
 
         # Verify that the data structure is present
@@ -216,9 +409,9 @@ class OrderBook(threading.Thread):
             raise OrderBookOutOfSync("Order book is initialising")
 
         # Verify that the market exists
-        try:
-            self.data_store[(base_currency, quote_currency)]
-        except KeyError:
+        market_data = self.data_store.get((base_currency.lower(), quote_currency.lower()))
+
+        if market_data is None:
             raise OrderBookError("The market %s - %s does not exist" % (base_currency.upper(),
                                                                         quote_currency.upper()))
 
@@ -227,27 +420,32 @@ class OrderBook(threading.Thread):
             raise OrderBookOutOfSync("Restart initialised")
 
         # Check that the market status is active
-        if self.data_store[(base_currency, quote_currency)]['status'] != 'active':
+        if market_data['status'] != 'active':
             raise OrderBookOutOfSync("Order book is not active")
 
         # Verify that the last heartbeat is less than the specified number of seconds ago
-        if datetime.datetime.now() > self.last_heartbeat + datetime.timedelta(seconds=last_heartbeat_interval):
+        heartbeat_age = time.monotonic() - self.last_heartbeat
+
+        if heartbeat_age > last_heartbeat_interval:
 
             # Raise out of sync error. We do not restart at this moment yet,
-            raise OrderBookOutOfSync("No update in the entire order book for %s seconds" %
-                                     (datetime.datetime.now() - self.last_heartbeat).seconds)
+            raise OrderBookOutOfSync("No update in the entire order book for %s seconds" % int(heartbeat_age))
+
+        # Verify that the top bid is not higher than or equal to the top ask, which would imply a problem. Both sides
+        # are sorted from low to high, so the top bid is the last entry.
+        order_book_ask = market_data['order_book_ask']
+        order_book_bid = market_data['order_book_bid']
 
-        # Verify that the top bid is not higher than or equal to the top ask, which would imply a problem
-        if len(self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_ask']) > 0 and \
-                len(self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_bid']) > 0:
-            if self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_ask'][0] <= \
-                    self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_bid'][0]:
+        if len(order_book_ask) > 0 and len(order_book_bid) > 0:
+            if order_book_ask.peekitem(0)[0] <= order_book_bid.peekitem(-1)[0]:
 
                 # Set the restart flag
                 self.restart = True
 
                 raise OrderBookOutOfSync("Inconsistent data in order book")
 
+        return market_data
+
     def initialisation_completed(self):
         """
         Verify whether the order book is active and the order books for all markets have been initialised
@@ -255,16 +453,8 @@ class OrderBook(threading.Thread):
         :return bool: True if all markets initialised, False if not
         """
 
-        # Not completed at all when the data store has no content
-        if len(self.data_store) == 0:
-            return False
-
-        # Each of the markets should be active
-        for _, item in self.data_store.items():
-            if item['status'] != 'active':
-                return False
-
-        return True
+        # Not completed at all when the data store has no content, otherwise each of the markets should be active
+        return len(self.data_store) > 0 and self.inactive_markets == 0
 
     def connect(self):
         """
@@ -276,6 +466,22 @@ class OrderBook(threading.Thread):
 
         raise NotImplementedError("The connect method should be overridden by a child class")
 
+    def create_connection(self, url):
+        """
+        Create a websocket connection to the given URL. Raises OrderBookError in case of connection issues.
+
+        :param url: URL of the websocket API
+        :return: handle of the socket connection
+        """
+
+        try:
+            # The connection is only used by the thread of this order book, so no locking is required. The UTF-8
+            # validation of text frames is skipped, as the JSON decoder validates the encoding of the messages already.
+            return websocket.create_connection(url, timeout=self.timeout, enable_multithread=False,
+                                               skip_utf8_validation=True)
+        except (websocket.WebSocketException, socket.timeout, ConnectionError, TimeoutError) as e:
+            raise OrderBookError("Could not connect to websocket: %s" % e)
+
     def disconnect(self):
         """
         Disconnect from the websocket API. No exceptions in case of issues, as failing to disconnect is not a problem.
@@ -296,10 +502,70 @@ class OrderBook(threading.Thread):
 
     def receive(self):
         """
-        Receive and process new websocket messages. To be overridden by the child class.
+        Receive and process new websocket messages. Blocks until a message arrives and then drains further messages that
+        are already waiting, up to MAX_RECEIVED_MESSAGES in total, so bursts of updates are processed as a single batch.
+
+        :return list: list of updates to be processed by the book
         """
 
-        raise NotImplementedError("The receive method should be overridden by a child class")
+        received_messages = [self.receive_message()]
+
+        while self.running and len(received_messages) < MAX_RECEIVED_MESSAGES and self.message_pending():
+            received_messages.append(self.receive_message())
+
+        update_messages = []
+
+        for received_message in received_messages:
+            update_messages.extend(self.process_message(received_message))
+
+        return update_messages
+
+    def receive_message(self):
+        """
+        Receive a single message from the websocket. The message is returned as bytes, as decoding it to a string is
+        not required for parsing the JSON content.
+
+        :return bytes: the raw message
+        """
+
+        try:
+            opcode, data = self.socket_handle.recv_data()
+        except (websocket.WebSocketException, TimeoutError, ConnectionError) as e:
+            raise OrderBookError("Websocket receive failed: %s" % e)
+
+        # Only text and binary frames contain data, other frames result in an empty message
+        if opcode != websocket.ABNF.OPCODE_TEXT and opcode != websocket.ABNF.OPCODE_BINARY:
+            return b''
+
+        return data
+
+    def process_message(self, received_message):
+        """
+        Decode a single websocket message and process its contents. To be overridden by the child class.
+
+        :param received_message: the raw message
+        :return list: list of updates to be processed by the book
+        """
+
+        raise NotImplementedError("The process_message method should be overridden by a child class")
+
+    def message_pending(self):
+        """
+        Verify whether another message is waiting on the websocket, so it can be received without blocking
+
+        :return bool: True if data is waiting, False if not
+        """
+
+        sock = self.socket_handle.sock
+
+        if sock is None:
+            return False
+
+        # Data that is already decrypted and buffered by the SSL layer is not visible to select
+        if isinstance(sock, ssl.SSLSocket) and sock.pending() > 0:
+            return True
+
+        return len(select.select([sock], [], [], 0)[0]) > 0
 
     def reset_data_structures(self):
         """
@@ -321,15 +587,12 @@ class OrderBook(threading.Thread):
         """
 
         # Verify that the order book is still up to date
-        self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
+        market_data = self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
 
         if not isinstance(amount, int) or amount < 1 or amount > 5000:
             raise OrderBookError("The number of requested asks should be an integer between 1 and 5000")
 
-        try:
-            return self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_ask'][:amount]
-        except KeyError:
-            raise OrderBookError("Unknown currency pair %s - %s" % (base_currency.upper(), quote_currency.upper()))
+        return top_asks(market_data['order_book_ask'], amount)
 
     def get_top_bids(self, base_currency, quote_currency, amount, last_heartbeat_interval=10):
         """
@@ -343,15 +606,32 @@ class OrderBook(threading.Thread):
         """
 
         # Verify that the order book is still up to date
-        self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
+        market_data = self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
 
         if not isinstance(amount, int) or amount < 1 or amount > 5000:
             raise OrderBookError("The number of requested bids should be an integer between 1 and 5000")
 
-        try:
-            return self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_bid'][:amount]
-        except KeyError:
-            raise OrderBookError("Unknown currency pair %s - %s" % (base_currency.upper(), quote_currency.upper()))
+        return top_bids(market_data['order_book_bid'], amount)
+
+    def get_top(self, base_currency, quote_currency, amount, last_heartbeat_interval=10):
+        """
+        Get the top asks and bids in the book at once, verifying the order book status only once
+
+        :param base_currency: market base currency
+        :param quote_currency: market quote currency
+        :param amount: number of asks and bids
+        :param last_heartbeat_interval: maximum allowed time in seconds since last heartbeat to still consider the
+                                        order book to be 'in sync'
+        :return tuple: the top asks and the top bids
+        """
+
+        # Verify that the order book is still up to date
+        market_data = self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
+
+        if not isinstance(amount, int) or amount < 1 or amount > 5000:
+            raise OrderBookError("The number of requested asks and bids should be an integer between 1 and 5000")
+
+        return top_asks(market_data['order_book_ask'], amount), top_bids(market_data['order_book_bid'], amount)
 
     def get_middle(self, base_currency, quote_currency, last_heartbeat_interval=10):
         """
@@ -364,10 +644,11 @@ class OrderBook(threading.Thread):
         """
 
         # Verify that the order book is still up to date
-        self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
+        market_data = self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
 
-        top_bid = self.get_top_bids(base_currency, quote_currency, 1, last_heartbeat_interval)[0][0]
-        top_ask = self.get_top_asks(base_currency, quote_currency, 1, last_heartbeat_interval)[0][0]
+        # The top ask is the first entry on the ask side, while the top bid is the last entry on the bid side
+        top_bid = market_data['order_book_bid'].peekitem(-1)[0]
+        top_ask = market_data['order_book_ask'].peekitem(0)[0]
 
         return (top_bid + top_ask) / 2
 
@@ -384,33 +665,15 @@ class OrderBook(threading.Thread):
         """
 
         # Verify that the order book is still up to date
-        self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
+        market_data = self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
 
         if not isinstance(rate, float) or rate < 0:
             raise OrderBookError("The desired rate should be a positive float")
 
-        # Verify that the market exists
-        try:
-            self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_ask']
-        except KeyError:
-            raise OrderBookError("Unknown currency pair %s - %s" % (base_currency.upper(), quote_currency.upper()))
-
-        index = 0
-
-        while index < len(self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_ask']):
-            entry = self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_ask'][index]
-
-            # If this is the desired rate, return amount offered
-            if entry[0] == rate:
-                return entry[1]
+        order_book = market_data['order_book_ask']
 
-            # Otherwise if the rate is too high, an entry with this amount didn't exist. Return 0.
-            elif entry[0] > rate:
-                return 0
-
-            # If this is not the case either, then the rate we are looking at is  too low. Continue to look at the next
-            # iteration.
-            index += 1
+        # Return 0 if an entry with this rate doesn't exist
+        return order_book.get(rate, 0)
 
     def get_bid_rate_amount(self, base_currency, quote_currency, rate, last_heartbeat_interval=10):
         """
@@ -425,33 +688,15 @@ class OrderBook(threading.Thread):
         """
 
         # Verify that the order book is still up to date
-        self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
+        market_data = self.verify_status(base_currency, quote_currency, last_heartbeat_interval)
 
         if not isinstance(rate, float) or rate < 0:
             raise OrderBookError("The desired rate should be a positive float")
 
-        # Verify that the market exists
-        try:
-            self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_bid']
-        except KeyError:
-            raise OrderBookError("Unknown currency pair %s - %s" % (base_currency.upper(), quote_currency.upper()))
-
-        index = 0
-
-        while index < len(self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_bid']):
-            entry = self.data_store[(base_currency.lower(), quote_currency.lower())]['order_book_bid'][index]
+        order_book = market_data['order_book_bid']
 
-            # If this is the desired rate, return amount offered
-            if entry[0] == rate:
-                return entry[1]
-
-            # Otherwise if the rate is too high, an entry with this amount didn't exist. Return 0.
-            elif entry[0] < rate:
-                return 0
-
-            # If this is not the case either, then the rate we are looking at is  too low. Continue to look at the next
-            # iteration.
-            index += 1
+        # Return 0 if an entry with this rate doesn't exist
+        return order_book.get(rate, 0)
 
     def stop(self):
         """
@@ -467,9 +712,7 @@ class OrderBook(threading.Thread):
         :return bool: True when initialisation completed
         """
 
-        # Continuously poll whether the initialisation completed
-        while True:
-            if self.initialisation_completed():
-                return True
-            else:
-                time.sleep(0.1)
+        # Wait until the last market becomes active
+        self.initialisation_event.wait()
+
+        return True
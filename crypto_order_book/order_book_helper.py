@@ -1,6 +1,17 @@
 # Copyright (c) 2017 - 2019 Ricardo Persoon
 # Distributed under the MIT software license, see the accompanying file LICENSE
 
+import sys
+
+
+# Header of the printed order book table
+TABLE_HEADER = ('============================================================================\n'
+                'Price ask        Amount              Price bid        Amount\n'
+                '============================================================================\n')
+
+# Format of a row of the printed order book table
+TABLE_ROW = "{0:>14.8f}   {1:>14.8f}      {2:>14.8f}   {3:>14.8f}      \n"
+
 
 def print_order_book(order_book, base_currency, quote_currency, count):
     """
@@ -12,37 +23,13 @@ def print_order_book(order_book, base_currency, quote_currency, count):
     :param count: number of rows to print
     """
 
-    # Get the data
-    asks = order_book.get_top_asks(base_currency, quote_currency, count)
-    bids = order_book.get_top_bids(base_currency, quote_currency, count)
+    # Get the data of both sides of the book at once
+    asks, bids = order_book.get_top(base_currency, quote_currency, count)
 
     if len(asks) != count or len(bids) != count:
         print("Not enough order book data available for printing")
         return
 
-    print('============================================================================')
-    print("Price ask        Amount              Price bid        Amount")
-    print('============================================================================')
-
-    for i in range(0, count):
-
-        price_ask = "{0:.8f}".format(asks[i][0])
-        for j in range(0, 14 - len(price_ask)):
-            print(' ', end='')
-        print('%s   ' % price_ask, end='')
-
-        amount_ask = "{0:.8f}".format(asks[i][1])
-        for j in range(0, 14 - len(amount_ask)):
-            print(' ', end='')
-        print('%s      ' % amount_ask, end='')
-
-        price_bid = "{0:.8f}".format(bids[i][0])
-        for j in range(0, 14 - len(price_bid)):
-            print(' ', end='')
-        print('%s   ' % price_bid, end='')
-
-        amount_bid = "{0:.8f}".format(bids[i][1])
-        for j in range(0, 14 - len(amount_bid)):
-            print(' ', end='')
-        print('%s      ' % amount_bid, end='')
-        print()
+    # Right align all values in columns of 14 characters, and write the entire table at once
+    sys.stdout.write(TABLE_HEADER + ''.join(TABLE_ROW.format(ask[0], ask[1], bid[0], bid[1])
+                                            for ask, bid in zip(asks, bids)))
@@ -2,16 +2,27 @@
 # Distributed under the MIT software license, see the accompanying file LICENSE
 
 from .exceptions import OrderBookError
-from .order_book import OrderBook
+from .order_book import OrderBook, UPDATE_ASK, UPDATE_BID, REMOVE_ASK, REMOVE_BID, LOAD_ASK, LOAD_BID, HEARTBEAT, \
+    json_loads
 
 import json
 import logging
-import socket
+import sys
 import websocket
 
 
 logger = logging.getLogger('Orderbook')
 
+# Raw heartbeat message as sent by Poloniex, used to recognise heartbeats without decoding them
+HEARTBEAT_MESSAGE = b'[1010]'
+
+# Translation of the Poloniex update types to the update types for an update and a removal on that side of the book.
+# Type 0 is an update on the ask side, type 1 an update on the bid side.
+UPDATE_TYPES = {
+    0: (UPDATE_ASK, REMOVE_ASK),
+    1: (UPDATE_BID, REMOVE_BID),
+}
+
 
 class PoloniexOrderBook(OrderBook):
 
@@ -29,6 +40,9 @@ class PoloniexOrderBook(OrderBook):
         # The Poloniex order book requires additional logic to translate the internal market ID to the actual market
         self.market_id_to_market = {}
 
+        # Encoded subscribe commands per market, which are reused when resubscribing after a restart
+        self.subscribe_commands = {}
+
     def connect(self):
         """
         Connect with the websocket API and return the handle. Raises OrderBookError in case of connection issues.
@@ -36,12 +50,7 @@ class PoloniexOrderBook(OrderBook):
         :return: handle of the socket connection
         """
 
-        try:
-            socket_handle = websocket.create_connection("wss://api2.poloniex.com:443", timeout=self.timeout)
-        except (websocket.WebSocketException, socket.timeout, ConnectionError, TimeoutError) as e:
-            raise OrderBookError("Could not connect to websocket: %s" % e)
-
-        return socket_handle
+        return self.create_connection("wss://api2.poloniex.com:443")
 
     def disconnect(self):
         """
@@ -62,30 +71,39 @@ class PoloniexOrderBook(OrderBook):
         :param quote_currency: desired quote currency
         """
 
-        # For Poloniex, the subscription command is a JSON instruction
-        command = '{"command" : "subscribe", "channel" : "%s_%s"}' % (quote_currency.upper(), base_currency.upper())
+        command = self.subscribe_commands.get((base_currency, quote_currency))
+
+        if command is None:
+
+            # For Poloniex, the subscription command is a JSON instruction
+            command = json.dumps({
+                'command': 'subscribe',
+                'channel': '%s_%s' % (quote_currency.upper(), base_currency.upper())
+            }).encode()
+
+            self.subscribe_commands[(base_currency, quote_currency)] = command
 
         # Send the instruction
         self.socket_handle.send(command)
 
-    def receive(self):
+    def process_message(self, received_message):
         """
-        Receive and process new websocket messages
+        Decode a single websocket message and process its contents
 
-        :return list: list of all messages received
+        :param received_message: the raw message
+        :return list: list of updates to be processed by the book
         """
 
-        try:
-            received_message = self.socket_handle.recv()
-        except (websocket.WebSocketException, TimeoutError, ConnectionError) as e:
-            raise OrderBookError("Websocket receive failed: %s" % e)
-
         # Discard empty messages
-        if len(str(received_message)) == 0:
+        if not received_message:
             return []
 
+        # Heartbeats are by far the most frequent message in quiet markets, so they are recognised from the raw bytes
+        if received_message == HEARTBEAT_MESSAGE:
+            return [(HEARTBEAT,)]
+
         try:
-            decoded_message = json.loads(received_message)
+            decoded_message = json_loads(received_message)
         except ValueError:
             raise OrderBookError("Couldn't decode JSON message after receiving update")
 
@@ -98,10 +116,18 @@ class PoloniexOrderBook(OrderBook):
 
         # Process heartbeat messages, for Poloniex consisting of a list with one integer: 1010
         if len(decoded_message) == 1 and decoded_message[0] == 1010:
-            message_list.append(['heartbeat'])
+            message_list.append((HEARTBEAT,))
 
         elif len(decoded_message) == 3:
 
+            # The market is translated only once for the entire message. Before the initialisation of the market has
+            # been processed, it is not known yet.
+            market = None
+
+            # Bind the methods used for every update to local names, to avoid an attribute lookup per update
+            process_update = self.process_update
+            append_message = message_list.append
+
             # Process all updates contained in the message in a loop. Index 2 contains the data, while index 0 is the
             # Poloniex market_id and index 1 the sequence number
             for update in decoded_message[2]:
@@ -114,13 +140,18 @@ class PoloniexOrderBook(OrderBook):
                 # Process general order book update (addition / removal)
                 elif update[0] == 'o':
 
+                    if market is None:
+                        market = self.translate_market_id_to_market(decoded_message[0])
+
                     # Call the process_update method and append the result data structure to the message_list
-                    message_list.append(self.process_update(decoded_message[0], update[1:4]))
+                    append_message(process_update(market, update[1:4]))
 
             # Verify the sequence number. Only doing this after processing the message, as the market currencies can
             # only be determined after receiving the initial message.
-            [base_currency, quote_currency] = self.translate_market_id_to_market(decoded_message[0])
-            self.verify_sequence(decoded_message[1], base_currency, quote_currency)
+            if market is None:
+                market = self.translate_market_id_to_market(decoded_message[0])
+
+            self.verify_sequence(decoded_message[1], market)
 
         else:
             logger.warning("Discarding unknown message: %s" % decoded_message)
@@ -146,11 +177,7 @@ class PoloniexOrderBook(OrderBook):
         """
 
         # Verify that the given market is not yet defined
-        try:
-            self.translate_market_id_to_market(market_id)
-        except OrderBookError:
-            pass
-        else:
+        if market_id in self.market_id_to_market:
             raise OrderBookError("Received initialisation for market with ID %s, which is already defined" % market_id)
 
         # Deduce the base and quote currency from the initialisation response
@@ -159,94 +186,85 @@ class PoloniexOrderBook(OrderBook):
         if len(currency_pair) != 2:
             raise OrderBookError("Invalid currency pair received: %s" % currency_pair)
 
-        # Insert the translation from market_id to market in the local storage
-        base_currency = currency_pair[1].lower()
-        quote_currency = currency_pair[0].lower()
-        self.market_id_to_market[market_id] = [base_currency, quote_currency]
+        # Insert the translation from market_id to market in the local storage. The currencies are interned, so they are
+        # the same string objects as used in the data store.
+        base_currency = sys.intern(currency_pair[1].lower())
+        quote_currency = sys.intern(currency_pair[0].lower())
 
-        # Compile all update messages in a list
-        update_messages = []
+        # The market is stored as a tuple, which can be used as key in the data store directly
+        self.market_id_to_market[market_id] = (base_currency, quote_currency)
 
-        # Process all asks
-        for rate, amount in initial_data['orderBook'][0].items():
-            update_messages.append(['update_ask', base_currency, quote_currency, float(rate), float(amount)])
+        # Each side of the book is loaded into the order book at once. The rates and amounts are sent as strings, which
+        # are converted in bulk by mapping float over the keys and values of each side of the book.
+        asks = initial_data['orderBook'][0]
+        bids = initial_data['orderBook'][1]
 
-        # Process all bids
-        for rate, amount in initial_data['orderBook'][1].items():
-            update_messages.append(['update_bid', base_currency, quote_currency, float(rate), float(amount)])
+        return [
+            (LOAD_ASK, base_currency, quote_currency, dict(zip(map(float, asks.keys()), map(float, asks.values())))),
+            (LOAD_BID, base_currency, quote_currency, dict(zip(map(float, bids.keys()), map(float, bids.values())))),
+        ]
 
-        return update_messages
-
-    def process_update(self, market_id, update_data):
+    def process_update(self, market, update_data):
         """
         Process an order book event
 
-        :param market_id: ID of the currency as reported by the API
+        :param market: tuple with base and quote currency of the market, as translated from the Poloniex market_id
         :param update_data: the update data
-        :return list: update data, containing the update type, base and quote currency and the rate
+        :return tuple: update data, containing the update type, base and quote currency and the rate
         """
 
-        # Translate the currency ID reported by the API to the pair we know
-        [base_currency, quote_currency] = self.translate_market_id_to_market(market_id)
-
-        update_type = int(update_data[0])
-        update_rate = float(update_data[1])
-        update_amount = float(update_data[2])
+        base_currency, quote_currency = market
 
-        # Type 0 is an update on the ask side of the order book
-        if update_type == 0:
+        update_types = UPDATE_TYPES.get(int(update_data[0]))
 
-            # Amount 0.0 indicates a removal from the book
-            if update_amount == 0.0:
-                return ['remove_ask', base_currency, quote_currency, update_rate]
-            else:
-                return ['update_ask', base_currency, quote_currency, update_rate, update_amount]
+        if update_types is None:
+            raise OrderBookError("Unexpected update type %s" % update_data[0])
 
-        # Type 1 is an update on the bid side of the order book
-        elif update_type == 1:
+        update_rate = float(update_data[1])
+        update_amount = float(update_data[2])
 
-            # Amount 0.0 indicates a removal from the book
-            if update_amount == 0.0:
-                return ['remove_bid', base_currency, quote_currency, update_rate]
-            else:
-                return ['update_bid', base_currency, quote_currency, update_rate, update_amount]
+        # Amount 0.0 indicates a removal from the book
+        if update_amount == 0.0:
+            return update_types[1], base_currency, quote_currency, update_rate
 
-        else:
-            raise OrderBookError("Unexpected update type %s" % update_type)
+        return update_types[0], base_currency, quote_currency, update_rate, update_amount
 
     def translate_market_id_to_market(self, market_id):
         """
         Translate a Poloniex internal market_id to the associated base and quote currency
 
         :param market_id: market_id as reported by Poloniex
-        :return list: list with base and quote currency
+        :return tuple: tuple with base and quote currency
         """
 
-        try:
-            return self.market_id_to_market[market_id]
-        except KeyError:
+        market = self.market_id_to_market.get(market_id)
+
+        if market is None:
             raise OrderBookError("Market with ID %s not yet defined" % market_id)
 
-    def verify_sequence(self, sequence_number, base_currency, quote_currency):
+        return market
+
+    def verify_sequence(self, sequence_number, market):
         """
         As Poloniex provides sequence numbers with updates, we can use those to verify the integrity of the order book
         by verifying we have received all messages. Initialises a restart of the order book and raises an exception if
         the sequence is incorrect. Each market has its own individual sequence number.
 
         :param sequence_number: received sequence number
-        :param base_currency: market base currency
-        :param quote_currency: market quote currency
+        :param market: tuple with base and quote currency of the market
         """
 
+        market_data = self.data_store[market]
+        last_sequence = market_data['last_sequence']
+
         # The new sequence number should be exactly the old number + 1
-        if self.data_store[(base_currency, quote_currency)]['last_sequence'] != sequence_number - 1 and \
-                self.data_store[(base_currency, quote_currency)]['last_sequence'] is not None:
+        if last_sequence != sequence_number - 1 and last_sequence is not None:
 
             logger.error("Invalid sequence number in order book: old sequence was %s, while the new sequence is %s" %
-                         (self.data_store[(base_currency, quote_currency)]['last_sequence'], sequence_number))
+                         (last_sequence, sequence_number))
 
             # Initiate a restart of the order book
             self.restart = True
 
         # Update the sequence number
-        self.data_store[(base_currency, quote_currency)]['last_sequence'] = sequence_number
+        market_data['last_sequence'] = sequence_number
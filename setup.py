@@ -11,9 +11,11 @@ setup(
    author='Ricardo Persoon',
    packages=['crypto_order_book'],
    install_requires=[
-      # We need to pin sortedcontainers to a 1.x version, as an incompatible and unfinished 2.x version was released
-      # that is still missing functionality that we need
-      'sortedcontainers==1.5.10',
+      'sortedcontainers>=2.4',
       'websocket-client'
-   ]
+   ],
+   extras_require={
+      # Faster decoding of websocket messages
+      'orjson': ['orjson']
+   }
 )
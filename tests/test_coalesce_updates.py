@@ -0,0 +1,167 @@
+# Copyright (c) 2017 - 2019 Ricardo Persoon
+# Distributed under the MIT software license, see the accompanying file LICENSE
+
+from crypto_order_book import PoloniexOrderBook
+from crypto_order_book.order_book import OrderBook, UPDATE_ASK, REMOVE_ASK, HEARTBEAT
+
+import json
+import unittest
+
+
+class TestCoalesceUpdates(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialise a Poloniex order book for the ETH - BTC market, without connecting to the exchange
+        """
+
+        self.order_book = PoloniexOrderBook([{'base_currency': 'eth', 'quote_currency': 'btc'}])
+        self.order_book.initialise_data_store()
+
+    def process_batch(self, messages):
+        """
+        Process a batch of Poloniex messages as received in a single receive
+
+        :param messages: list with the messages
+        """
+
+        updates = []
+
+        for message in messages:
+            updates.extend(self.order_book.process_message(json.dumps(message).encode()))
+
+        self.order_book.process_updates(updates)
+
+    def test_removal_of_loaded_rate_in_same_batch(self):
+        """
+        An update followed by a removal of a rate loaded earlier in the same batch should remove the rate
+        """
+
+        self.process_batch([
+            [148, 1, [['i', {'currencyPair': 'BTC_ETH', 'orderBook': [{'0.0200': '5.0', '0.0210': '3.0'},
+                                                                      {'0.0190': '4.0'}]}]]],
+            [148, 2, [['o', 0, '0.0200', '7.0']]],
+            [148, 3, [['o', 0, '0.0200', '0.0']]],
+        ])
+
+        self.assertEqual(dict(self.order_book.data_store[('eth', 'btc')]['order_book_ask']), {0.021: 3.0})
+        self.assertFalse(self.order_book.restart)
+
+
+
+class TestCoalesceRules(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialise two order books with an ask at rate 1.0: one to process batches as a whole, and a reference to apply
+        the same updates one by one
+        """
+
+        self.order_book = OrderBook([{'base_currency': 'eth', 'quote_currency': 'btc'}])
+        self.reference = OrderBook([{'base_currency': 'eth', 'quote_currency': 'btc'}])
+
+        for order_book in (self.order_book, self.reference):
+            order_book.initialise_data_store()
+            order_book.update((UPDATE_ASK, 'eth', 'btc', 1.0, 1.0))
+
+    def process_batch(self, updates):
+        """
+        Process a batch of updates in the order book and apply them one by one in the reference. Verifies that the
+        resulting books and restart flags are the same.
+
+        :param updates: list with update messages
+        :return list: the collapsed updates
+        """
+
+        net_updates = self.order_book.coalesce_updates(updates)
+        self.order_book.process_updates(updates)
+
+        for update_content in updates:
+            self.reference.update(update_content)
+
+        self.assertEqual(dict(self.order_book.data_store[('eth', 'btc')]['order_book_ask']),
+                         dict(self.reference.data_store[('eth', 'btc')]['order_book_ask']))
+        self.assertEqual(self.order_book.restart, self.reference.restart)
+
+        return net_updates
+
+    def test_later_update_overwrites(self):
+        """
+        Only the last update of a rate should be kept
+        """
+
+        net_updates = self.process_batch([(UPDATE_ASK, 'eth', 'btc', 2.0, 1.0), (UPDATE_ASK, 'eth', 'btc', 2.0, 3.0)])
+
+        self.assertEqual(net_updates, [(UPDATE_ASK, 'eth', 'btc', 2.0, 3.0)])
+
+    def test_update_and_removal_of_new_rate_cancel(self):
+        """
+        An update followed by a removal of a rate that is not in the book should cancel out
+        """
+
+        net_updates = self.process_batch([(UPDATE_ASK, 'eth', 'btc', 2.0, 1.0), (REMOVE_ASK, 'eth', 'btc', 2.0)])
+
+        self.assertEqual(net_updates, [])
+        self.assertFalse(self.order_book.restart)
+
+    def test_removal_of_existing_rate_is_kept(self):
+        """
+        A removal of a rate in the book should be kept, also after an update of that rate
+        """
+
+        net_updates = self.process_batch([(UPDATE_ASK, 'eth', 'btc', 1.0, 2.0), (REMOVE_ASK, 'eth', 'btc', 1.0)])
+
+        self.assertIn((REMOVE_ASK, 'eth', 'btc', 1.0), net_updates)
+        self.assertFalse(self.order_book.restart)
+
+    def test_removal_readd_removal(self):
+        """
+        Removing, adding and again removing a rate in the book should remove it without a restart
+        """
+
+        net_updates = self.process_batch([(REMOVE_ASK, 'eth', 'btc', 1.0), (UPDATE_ASK, 'eth', 'btc', 1.0, 2.0),
+                                          (REMOVE_ASK, 'eth', 'btc', 1.0)])
+
+        self.assertEqual(net_updates.count((REMOVE_ASK, 'eth', 'btc', 1.0)), 2)
+        self.assertNotIn(1.0, self.order_book.data_store[('eth', 'btc')]['order_book_ask'])
+        self.assertFalse(self.order_book.restart)
+
+    def test_removal_of_unknown_rate_restarts(self):
+        """
+        A removal of a rate that is not in the book should initiate a restart
+        """
+
+        self.process_batch([(REMOVE_ASK, 'eth', 'btc', 2.0)])
+
+        self.assertTrue(self.order_book.restart)
+
+    def test_removal_of_unknown_rate_before_readd_restarts(self):
+        """
+        A removal of a rate that is not in the book should initiate a restart, also if the rate is added later on
+        """
+
+        self.process_batch([(REMOVE_ASK, 'eth', 'btc', 2.0), (UPDATE_ASK, 'eth', 'btc', 2.0, 1.0)])
+
+        self.assertTrue(self.order_book.restart)
+
+    def test_double_removal_restarts(self):
+        """
+        Removing a rate twice without adding it in between should initiate a restart
+        """
+
+        self.process_batch([(REMOVE_ASK, 'eth', 'btc', 1.0), (REMOVE_ASK, 'eth', 'btc', 1.0)])
+
+        self.assertTrue(self.order_book.restart)
+
+    def test_heartbeats_collapse(self):
+        """
+        Several heartbeats in a batch should collapse to a single heartbeat
+        """
+
+        net_updates = self.process_batch([(HEARTBEAT,), (UPDATE_ASK, 'eth', 'btc', 2.0, 1.0), (HEARTBEAT,)])
+
+        self.assertEqual(net_updates, [(HEARTBEAT,), (UPDATE_ASK, 'eth', 'btc', 2.0, 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
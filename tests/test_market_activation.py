@@ -0,0 +1,96 @@
+# Copyright (c) 2017 - 2019 Ricardo Persoon
+# Distributed under the MIT software license, see the accompanying file LICENSE
+
+from crypto_order_book import BitfinexOrderBook, PoloniexOrderBook
+from crypto_order_book.order_book import REMOVE_ASK
+
+import json
+import unittest
+
+
+class TestMarketActivation(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialise a Poloniex order book for the ETH - BTC and LTC - BTC markets, without connecting to the exchange
+        """
+
+        self.order_book = PoloniexOrderBook([{'base_currency': 'eth', 'quote_currency': 'btc'},
+                                             {'base_currency': 'ltc', 'quote_currency': 'btc'}])
+        self.order_book.initialise_data_store()
+
+    def process_batch(self, messages):
+        """
+        Process a batch of Poloniex messages as received in a single receive
+
+        :param messages: list with the messages
+        """
+
+        updates = []
+
+        for message in messages:
+            updates.extend(self.order_book.process_message(json.dumps(message).encode()))
+
+        self.order_book.process_updates(updates)
+
+    def test_initialisations_in_same_batch(self):
+        """
+        All markets initialised in the same batch should be activated
+        """
+
+        self.process_batch([
+            [148, 1, [['i', {'currencyPair': 'BTC_ETH', 'orderBook': [{'0.0200': '5.0'}, {'0.0190': '4.0'}]}]]],
+            [50, 1, [['i', {'currencyPair': 'BTC_LTC', 'orderBook': [{'0.0080': '2.0'}, {'0.0070': '1.0'}]}]]],
+        ])
+
+        self.assertEqual(self.order_book.data_store[('eth', 'btc')]['status'], 'active')
+        self.assertEqual(self.order_book.data_store[('ltc', 'btc')]['status'], 'active')
+        self.assertEqual(self.order_book.inactive_markets, 0)
+        self.assertTrue(self.order_book.initialisation_event.is_set())
+
+    def test_removal_does_not_activate(self):
+        """
+        A batch with only removals should not activate the market
+        """
+
+        self.order_book.soft_delete_fail = True
+        self.order_book.process_updates([(REMOVE_ASK, 'eth', 'btc', 0.02)])
+
+        self.assertNotEqual(self.order_book.data_store[('eth', 'btc')]['status'], 'active')
+        self.assertEqual(self.order_book.inactive_markets, 2)
+
+
+
+class TestBitfinexMarketActivation(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialise a Bitfinex order book for the ETH - BTC and LTC - BTC markets, without connecting to the exchange
+        """
+
+        self.order_book = BitfinexOrderBook([{'base_currency': 'eth', 'quote_currency': 'btc'},
+                                             {'base_currency': 'ltc', 'quote_currency': 'btc'}])
+        self.order_book.initialise_data_store()
+
+    def test_snapshots_in_same_batch(self):
+        """
+        All markets of which the snapshot is received in the same batch should be activated
+        """
+
+        updates = []
+
+        for message in [{'event': 'subscribed', 'pair': 'ETHBTC', 'chanId': 5},
+                        {'event': 'subscribed', 'pair': 'LTCBTC', 'chanId': 6},
+                        [5, [[0.019, 1, 4.0], [0.02, 1, -5.0]]],
+                        [6, [[0.007, 1, 1.0], [0.008, 1, -2.0]]]]:
+            updates.extend(self.order_book.process_message(json.dumps(message).encode()))
+
+        self.order_book.process_updates(updates)
+
+        self.assertEqual(self.order_book.data_store[('eth', 'btc')]['status'], 'active')
+        self.assertEqual(self.order_book.data_store[('ltc', 'btc')]['status'], 'active')
+        self.assertTrue(self.order_book.initialisation_event.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# Copyright (c) 2017 - 2019 Ricardo Persoon
+# Distributed under the MIT software license, see the accompanying file LICENSE
+
+from crypto_order_book import PoloniexOrderBook
+from crypto_order_book.order_book import MAX_RECEIVED_MESSAGES
+
+import socket
+import unittest
+import websocket
+
+
+class SocketPairConnection:
+
+    def __init__(self, messages):
+        """
+        Websocket connection replacement, of which the pending messages are signalled through a local socket pair
+
+        :param messages: list with the raw messages to be received
+        """
+
+        self.messages = list(messages)
+        self.remote, self.sock = socket.socketpair()
+        self.remote.sendall(b'x' * len(self.messages))
+
+    def recv_data(self):
+        """
+        Receive the next message
+
+        :return tuple: opcode and data of the message
+        """
+
+        self.sock.recv(1)
+
+        return websocket.ABNF.OPCODE_TEXT, self.messages.pop(0)
+
+    def close(self):
+        """
+        Close the socket pair
+        """
+
+        self.remote.close()
+        self.sock.close()
+
+
+class TestReceive(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Initialise a Poloniex order book with a connection that has more heartbeats pending than a single receive drains
+        """
+
+        self.order_book = PoloniexOrderBook([{'base_currency': 'eth', 'quote_currency': 'btc'}])
+        self.order_book.socket_handle = SocketPairConnection([b'[1010]'] * (MAX_RECEIVED_MESSAGES + 10))
+
+    def tearDown(self):
+        """
+        Close the connection replacement
+        """
+
+        self.order_book.socket_handle.close()
+
+    def test_receive_is_limited(self):
+        """
+        A single receive should not receive more than MAX_RECEIVED_MESSAGES messages
+        """
+
+        self.assertEqual(len(self.order_book.receive()), MAX_RECEIVED_MESSAGES)
+        self.assertEqual(len(self.order_book.receive()), 10)
+
+    def test_receive_stops_draining_when_stopped(self):
+        """
+        A stopped order book should not drain further messages
+        """
+
+        self.order_book.running = False
+
+        self.assertEqual(len(self.order_book.receive()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()